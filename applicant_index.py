@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+from config import APPLICANT_INDEX_DIR, APPLICANTS_EXPORT_DIR, OUTPUT_DATE_FORMAT
+from data_utils import load_json_file, write_json_file
+
+ApplicantIndex = dict[str, dict]
+
+SUMMARY_FIELDS = ["полное наименование", "почта", "телефон1", "адрес"]
+LOCK_TIMEOUT = 30
+
+
+def _records_path(registry: str) -> str:
+    return os.path.join(APPLICANT_INDEX_DIR, f"records_{registry}.json")
+
+
+def _applicant_path(ogrn: str) -> str:
+    return os.path.join(APPLICANT_INDEX_DIR, f"{ogrn}.json")
+
+
+@contextmanager
+def _file_lock(file_path: str):
+    # Файлы заявителей общие для парсеров rss и rds, которые могут работать одновременно
+    lock_path = f"{file_path}.lock"
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > LOCK_TIMEOUT:
+                    logging.warning(f"Снята зависшая блокировка '{lock_path}'")
+                    os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(lock_path)
+
+
+def load_applicant_index(registry: str) -> ApplicantIndex:
+    if not os.path.exists(APPLICANT_INDEX_DIR):
+        os.makedirs(APPLICANT_INDEX_DIR)
+
+    records_path = _records_path(registry)
+    records = load_json_file(records_path) if os.path.exists(records_path) else {}
+    # records: {id записи: [огрн, хеш записи]}, changes: {огрн: {id записи: запись или None}}
+    return {"registry": registry, "records": records, "changes": {}}
+
+
+def _to_builtin(value):
+    # numpy-скаляры из DataFrame не сериализуются в JSON, а NaN не равен сам себе при сравнении записей
+    value = value.item() if hasattr(value, "item") else value
+    return None if isinstance(value, float) and value != value else value
+
+
+def _record_date(record: dict) -> str:
+    try:
+        return datetime.strptime(record.get("дата оформления") or "", OUTPUT_DATE_FORMAT).strftime("%Y-%m-%d")
+    except ValueError:
+        return ""
+
+
+def _record_hash(record: dict) -> str:
+    return hashlib.md5(json.dumps(record, ensure_ascii=False, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def update_applicant_index(index: ApplicantIndex, output: dict) -> bool:
+    registry = index["registry"]
+    record = {key: _to_builtin(value) for key, value in output.items()}
+    record["реестр"] = registry
+    record_id = str(record["id"])
+    ogrn = str(record["огрн"]) if record.get("огрн") else None
+
+    previous = index["records"].get(record_id)
+    previous_ogrn = previous[0] if previous else None
+    record_hash = _record_hash(record)
+    if previous_ogrn == ogrn and (ogrn is None or previous[1] == record_hash):
+        return False
+
+    if previous_ogrn and previous_ogrn != ogrn:
+        index["changes"].setdefault(previous_ogrn, {})[record_id] = None
+
+    if ogrn is None:
+        del index["records"][record_id]
+    else:
+        index["changes"].setdefault(ogrn, {})[record_id] = record
+        index["records"][record_id] = [ogrn, record_hash]
+    return True
+
+
+def _merge_latest(applicant: dict, record: dict) -> None:
+    record_date = _record_date(record)
+    latest_dates = applicant["даты"]
+    for field in SUMMARY_FIELDS:
+        if record.get(field) and record_date >= latest_dates.get(field, ""):
+            applicant[field] = record[field]
+            latest_dates[field] = record_date
+
+
+def _recompute_latest(applicant: dict) -> None:
+    applicant["даты"] = {}
+    for field in SUMMARY_FIELDS:
+        applicant[field] = None
+    for record in applicant["records"].values():
+        _merge_latest(applicant, record)
+
+
+def _apply_changes(ogrn: str, registry: str, changes: dict) -> None:
+    applicant_path = _applicant_path(ogrn)
+    with _file_lock(applicant_path):
+        if os.path.exists(applicant_path):
+            applicant = load_json_file(applicant_path)
+        else:
+            applicant = {"огрн": ogrn, "records": {}, "даты": {}}
+
+        recompute = False
+        for record_id, record in changes.items():
+            record_key = f"{registry}:{record_id}"
+            # Удаление или замена записи может сделать устаревшими текущие контакты
+            recompute = recompute or record_key in applicant["records"]
+            if record is None:
+                applicant["records"].pop(record_key, None)
+            else:
+                applicant["records"][record_key] = record
+                if not recompute:
+                    _merge_latest(applicant, record)
+
+        if not applicant["records"]:
+            if os.path.exists(applicant_path):
+                os.remove(applicant_path)
+            return
+
+        if recompute:
+            _recompute_latest(applicant)
+        write_json_file(applicant, applicant_path)
+
+
+def save_applicant_index(index: ApplicantIndex) -> None:
+    registry = index["registry"]
+    for ogrn, changes in index["changes"].items():
+        _apply_changes(ogrn, registry, changes)
+
+    # Карта записей сохраняется последней: при сбое выше изменения будут применены повторно при следующем запуске
+    write_json_file(index["records"], _records_path(registry))
+    logging.info(f"Обновлены данные {len(index['changes'])} заявителей в '{APPLICANT_INDEX_DIR}'")
+    index["changes"] = {}
+
+
+def get_applicant(ogrn: str) -> dict | None:
+    applicant_path = _applicant_path(str(ogrn))
+    if not os.path.exists(applicant_path):
+        return None
+    return load_json_file(applicant_path)
+
+
+def export_applicant(ogrn: str) -> str | None:
+    applicant = get_applicant(ogrn)
+    if not applicant:
+        logging.info(f"Заявитель с ОГРН {ogrn} не найден в индексе")
+        return None
+
+    if not os.path.exists(APPLICANTS_EXPORT_DIR):
+        os.makedirs(APPLICANTS_EXPORT_DIR)
+
+    file_path = os.path.join(APPLICANTS_EXPORT_DIR, f"{applicant['огрн']}.csv")
+    records = sorted(applicant["records"].values(), key=_record_date, reverse=True)
+    df = pd.DataFrame(records)
+    df.to_csv(file_path, index=False)
+    logging.info(f"Данные {df.shape[0]} документов заявителя {applicant['огрн']} сохранены в '{file_path}'")
+    return file_path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        exit("Использование: python applicant_index.py <ОГРН> [<ОГРН> ...]")
+
+    for applicant_ogrn in sys.argv[1:]:
+        export_applicant(applicant_ogrn)
@@ -2,11 +2,13 @@ import logging
 import os
 import shutil
 import time
+from collections.abc import Callable
 from datetime import datetime
 
 import pandas as pd
 from tqdm import tqdm
 
+from applicant_index import load_applicant_index, save_applicant_index, update_applicant_index
 from config import (
     CERT_DATA_PATH,
     CERT_PAGE_SIZE,
@@ -80,6 +82,7 @@ def fetch_all_certificate_pages(
     min_end_date: str = "",
     max_end_date: str = "",
     filter_tech_reg_ids: dict = None,
+    on_page: Callable | None = None,
 ):
     if filter_tech_reg_ids is None:
         filter_tech_reg_ids = {}
@@ -90,6 +93,8 @@ def fetch_all_certificate_pages(
         max_end_date=max_end_date,
         filter_tech_reg_ids=list(filter_tech_reg_ids.keys()),
     )
+    if on_page:
+        on_page()
     items = first_page["items"]
     total_pages = calculate_total_pages(first_page["total"], CERT_PAGE_SIZE)
 
@@ -97,6 +102,8 @@ def fetch_all_certificate_pages(
         for page in range(1, total_pages):
             page_data = fetch_certificate_page(page, min_end_date=min_end_date, max_end_date=max_end_date)
             items.extend(page_data["items"])
+            if on_page:
+                on_page()
             time.sleep(0.1)
             pbar.update(1)
 
@@ -118,9 +125,9 @@ def fetch_types_map() -> dict:
     return types_map
 
 
-def fetch_certificate_details(certificate_id: int) -> dict:
+def fetch_certificate_details(certificate_id: int, refresh: bool = False) -> dict:
     detail_path = os.path.join(CERTIFICATES_DETAILS_DIR, f"{certificate_id}.json")
-    if os.path.exists(detail_path):
+    if not refresh and os.path.exists(detail_path):
         return load_json_file(detail_path)
 
     url = f"https://pub.fsa.gov.ru/api/v1/rss/common/certificates/{certificate_id}"
@@ -162,6 +169,8 @@ def parse_certificates():
     df = df.drop_duplicates(subset="id", keep="first", ignore_index=True)
 
     output_data = []
+    applicant_index = load_applicant_index("rss")
+    index_changed = False
 
     total_rows = df.shape[0]
 
@@ -218,9 +227,13 @@ def parse_certificates():
             raise e
 
         output_data.append(output)
+        index_changed = update_applicant_index(applicant_index, output) or index_changed
 
     save_certificates_to_file(output_data)
 
+    if index_changed:
+        save_applicant_index(applicant_index)
+
 
 if __name__ == "__main__":
     parse_certificates()
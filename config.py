@@ -9,6 +9,11 @@ IDS_TECH_REG = str(os.getenv("IDS_TECH_REG"))
 MIN_END_DATE = str(os.getenv("MIN_END_DATE"))
 MAX_END_DATE = str(os.getenv("MAX_END_DATE"))
 
+PREFETCH_INTERVAL = int(os.getenv("PREFETCH_INTERVAL", 3600))
+PREFETCH_REQUEST_DELAY = float(os.getenv("PREFETCH_REQUEST_DELAY", 1))
+PREFETCH_MAX_REQUESTS = int(os.getenv("PREFETCH_MAX_REQUESTS", 0))
+PREFETCH_MAX_AGE_DAYS = int(os.getenv("PREFETCH_MAX_AGE_DAYS", 30))
+
 DOWNLOADS_DIR = "downloads"
 
 CERT_PAGE_SIZE = 100
@@ -23,6 +28,11 @@ DECL_DATA_PATH = os.path.join(DOWNLOADS_DIR, f"decl_data_{MIN_END_DATE}_{MAX_END
 OUTPUT_DECLS_PATH = os.path.join(DOWNLOADS_DIR, f"declarations_{MIN_END_DATE}_{MAX_END_DATE}.csv")
 DECL_TYPES_MAP_FILE_PATH = os.path.join(DOWNLOADS_DIR, "decl_types_map.json")
 
+APPLICANT_INDEX_DIR = f"{DOWNLOADS_DIR}/applicant_index"
+APPLICANTS_EXPORT_DIR = f"{DOWNLOADS_DIR}/applicants"
+
+PREFETCH_STATE_PATH = os.path.join(DOWNLOADS_DIR, "prefetch_state.json")
+
 TRTS_FILE_PATH = os.path.join(DOWNLOADS_DIR, "trts.json")
 FILTER_DATE_FORMAT = "%Y-%m-%d"
 OUTPUT_DATE_FORMAT = "%d/%m/%Y"
@@ -1,5 +1,6 @@
 import json
 import logging
+import os
 
 
 def load_json_file(file_path: str) -> dict:
@@ -10,9 +11,21 @@ def load_json_file(file_path: str) -> dict:
         raise e
 
 
-def save_json_file(data: dict, file_path: str) -> None:
+def write_json_file(data: dict, file_path: str) -> None:
+    # Пишем во временный файл и подменяем целиком, чтобы параллельный процесс не прочитал файл наполовину
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
     try:
-        with open(file_path, "w", encoding="utf-8") as file:
+        with open(tmp_path, "w", encoding="utf-8") as file:
             json.dump(data, file, ensure_ascii=False)
+        os.replace(tmp_path, file_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def save_json_file(data: dict, file_path: str) -> None:
+    try:
+        write_json_file(data, file_path)
     except Exception as e:
         logging.error(f"Ошибка при сохранении файла {file_path}: {e}")
@@ -1,6 +1,7 @@
 import logging
 import os
 import shutil
+from collections.abc import Callable
 from datetime import datetime
 from time import sleep
 
@@ -8,6 +9,7 @@ import pandas as pd
 from icecream import ic
 from tqdm import tqdm
 
+from applicant_index import load_applicant_index, save_applicant_index, update_applicant_index
 from config import (
     DECL_DATA_PATH,
     DECL_PAGE_SIZE,
@@ -80,7 +82,8 @@ def fetch_all_declaration_pages(
     min_end_date: str = "",
     max_end_date: str = "",
     filter_tech_reg_ids: dict | None = None,
-) -> None:
+    on_page: Callable | None = None,
+) -> bool:
     if filter_tech_reg_ids is None:
         filter_tech_reg_ids = {}
     min_end_date_parsed = parse_date(min_end_date)
@@ -96,6 +99,8 @@ def fetch_all_declaration_pages(
                 max_end_date=max_end_date_parsed,
                 filter_tech_reg_ids=list(filter_tech_reg_ids.keys()),
             )
+            if on_page:
+                on_page()
             if not page_data["items"]:
                 break
             items.extend(page_data["items"])
@@ -104,7 +109,7 @@ def fetch_all_declaration_pages(
 
     if not items:
         logging.info("Данных по этим параметрам не найдено")
-        exit()
+        return False
 
     df = pd.DataFrame(items)
 
@@ -122,6 +127,7 @@ def fetch_all_declaration_pages(
 
     df.to_csv(filename, index=False)
     logging.info(f"Данные {page} страниц с декларациями успешно сохранены в файл '{filename}'")
+    return True
 
 
 def fetch_types_map() -> dict:
@@ -137,20 +143,23 @@ def fetch_types_map() -> dict:
     return types_map
 
 
-def fetch_declaration_details(declaration_id: int) -> dict:
+def fetch_declaration_details(declaration_id: int, refresh: bool = False) -> dict:
     detail_path = os.path.join(DECLARATIONS_DETAILS_DIR, f"{declaration_id}.json")
     try:
-        return load_json_file(detail_path)
+        if not refresh:
+            return load_json_file(detail_path)
     except FileNotFoundError:
-        url = f"https://pub.fsa.gov.ru/api/v1/rds/common/declarations/{declaration_id}"
-        details = fetch_data_with_retry(url, method="get")
-        save_json_file(details, detail_path)
-        sleep(0.2)
-        return details
+        pass
     except Exception as e:
         logging.error(f"Ошибка при загрузке файла {detail_path}: {e}")
         raise
 
+    url = f"https://pub.fsa.gov.ru/api/v1/rds/common/declarations/{declaration_id}"
+    details = fetch_data_with_retry(url, method="get")
+    save_json_file(details, detail_path)
+    sleep(0.2)
+    return details
+
 
 def save_declarations_to_file(output_data: list) -> None:
     df = pd.DataFrame(output_data)
@@ -171,12 +180,13 @@ def parse_declarations() -> None:
     status_map = {status["id"]: status["name"] for status in types_map.get("status", {}).values()}
 
     if not os.path.exists(DECL_DATA_PATH):
-        fetch_all_declaration_pages(
+        if not fetch_all_declaration_pages(
             DECL_DATA_PATH,
             min_end_date=MIN_END_DATE,
             max_end_date=MAX_END_DATE,
             filter_tech_reg_ids=filtered_trts,
-        )
+        ):
+            exit()
     else:
         logging.info(f"Файл '{DECL_DATA_PATH}' уже существует, загрузка не требуется.")
 
@@ -185,6 +195,8 @@ def parse_declarations() -> None:
     df["manufacterName"] = df["manufacterName"].apply(lambda x: x.replace("\n", " ").replace("\r", " "))
 
     output_data = []
+    applicant_index = load_applicant_index("rds")
+    index_changed = False
 
     total_rows = df.shape[0]
 
@@ -263,9 +275,13 @@ def parse_declarations() -> None:
             raise e
 
         output_data.append(output)
+        index_changed = update_applicant_index(applicant_index, output) or index_changed
 
     save_declarations_to_file(output_data)
 
+    if index_changed:
+        save_applicant_index(applicant_index)
+
 
 if __name__ == "__main__":
     try:
@@ -64,9 +64,8 @@ def fetch_data_with_retry(
     if retry_delays is None:
         retry_delays = [10, 30, 60]
 
-    response = None
-
     for attempt in range(max_retries):
+        response = None
         try:
             response = (
                 requests.get(url, verify=False, headers=headers, json=params)
@@ -78,16 +77,19 @@ def fetch_data_with_retry(
             return response.json()
 
         except requests.exceptions.RequestException as e:
-            if response.status_code in {401, 403}:
+            # При ошибке соединения ответа нет вовсе
+            status_code = response.status_code if response is not None else None
+
+            if status_code in {401, 403}:
                 raise BearerTokenError("Нужно заменить BEARER_TOKEN") from e
 
-            if response.status_code == 502 and attempt < len(retry_delays):
+            if status_code == 502 and attempt < len(retry_delays):
                 sleep(retry_delays[attempt])
                 continue
 
             if attempt < max_retries - 1:
                 sleep(2 * (attempt + 1))
-            elif response.status_code == 502:
+            elif status_code == 502:
                 raise DataRetrievalError("Ошибка 502: Сервер недоступен после всех попыток") from e
             else:
                 raise DataRetrievalError(f"Ошибка при запросе (попытка {attempt + 1}): {e}") from e
@@ -0,0 +1,224 @@
+import logging
+import os
+import sys
+import time
+from collections.abc import Callable
+
+import pandas as pd
+
+from certificate_parser import fetch_all_certificate_pages, fetch_certificate_details
+from config import (
+    CERT_DATA_PATH,
+    CERTIFICATES_DETAILS_DIR,
+    DECL_DATA_PATH,
+    DECLARATIONS_DETAILS_DIR,
+    IDS_TECH_REG,
+    MAX_END_DATE,
+    MIN_END_DATE,
+    PREFETCH_INTERVAL,
+    PREFETCH_MAX_AGE_DAYS,
+    PREFETCH_MAX_REQUESTS,
+    PREFETCH_REQUEST_DELAY,
+    PREFETCH_STATE_PATH,
+)
+from data_utils import load_json_file, save_json_file
+from declaration_parser import fetch_all_declaration_pages, fetch_declaration_details
+from main import BearerTokenError, DataRetrievalError, get_trts_data
+
+REGISTRIES = [
+    (
+        "rss",
+        "сертификатов",
+        CERT_DATA_PATH,
+        CERTIFICATES_DETAILS_DIR,
+        fetch_all_certificate_pages,
+        fetch_certificate_details,
+    ),
+    (
+        "rds",
+        "деклараций",
+        DECL_DATA_PATH,
+        DECLARATIONS_DETAILS_DIR,
+        fetch_all_declaration_pages,
+        fetch_declaration_details,
+    ),
+]
+
+
+def new_budget() -> dict:
+    return {"limit": PREFETCH_MAX_REQUESTS or None, "used": 0}
+
+
+def budget_exhausted(budget: dict) -> bool:
+    return budget["limit"] is not None and budget["used"] >= budget["limit"]
+
+
+def spend_request(budget: dict) -> None:
+    budget["used"] += 1
+    time.sleep(PREFETCH_REQUEST_DELAY)
+
+
+def load_prefetch_state() -> dict:
+    # Статусы, с которыми карточки были успешно загружены демоном: {реестр: {id: idStatus}}
+    if os.path.exists(PREFETCH_STATE_PATH):
+        try:
+            return load_json_file(PREFETCH_STATE_PATH)
+        except ValueError as e:
+            logging.error(f"Файл '{PREFETCH_STATE_PATH}' поврежден и будет создан заново: {e}")
+    return {}
+
+
+def load_listing_statuses(file_path: str) -> dict:
+    if not os.path.exists(file_path):
+        return {}
+    try:
+        df = pd.read_csv(file_path)
+    except pd.errors.EmptyDataError:
+        return {}
+    if not {"id", "idStatus"}.issubset(df.columns):
+        return {}
+    df = df.dropna(subset=["id", "idStatus"]).drop_duplicates(subset="id", keep="first")
+    return {str(int(item_id)): _to_builtin(status) for item_id, status in zip(df["id"], df["idStatus"])}
+
+
+def _to_builtin(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+def load_cached_status(detail_path: str):
+    try:
+        return load_json_file(detail_path).get("idStatus")
+    except ValueError:
+        return None
+
+
+def refresh_listing(file_path: str, fetch_all_pages: Callable, filtered_trts: dict, budget: dict) -> dict:
+    if budget_exhausted(budget):
+        logging.info(f"Лимит запросов исчерпан, используется сохраненный список '{file_path}'")
+        return load_listing_statuses(file_path)
+
+    tmp_path = f"{file_path}.tmp"
+    try:
+        found = fetch_all_pages(
+            tmp_path,
+            min_end_date=MIN_END_DATE,
+            max_end_date=MAX_END_DATE,
+            filter_tech_reg_ids=filtered_trts,
+            on_page=lambda: spend_request(budget),
+        )
+        if found is False:
+            return {}
+        os.replace(tmp_path, file_path)
+    except DataRetrievalError as e:
+        logging.error(f"Не удалось обновить список '{file_path}', используется сохраненный: {e}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return load_listing_statuses(file_path)
+
+
+def select_ids_to_fetch(details_dir: str, known_statuses: dict, current_statuses: dict) -> list[tuple[str, bool]]:
+    max_age = PREFETCH_MAX_AGE_DAYS * 24 * 60 * 60
+    now = time.time()
+    new_ids, changed_ids, stale_ids = [], [], []
+
+    for item_id, status in current_statuses.items():
+        detail_path = os.path.join(details_dir, f"{item_id}.json")
+        if not os.path.exists(detail_path):
+            new_ids.append((item_id, False))
+            continue
+
+        if item_id not in known_statuses:
+            # Карточка загружена парсером, а не демоном: берем статус из нее самой
+            cached_status = load_cached_status(detail_path)
+            if cached_status is None:
+                changed_ids.append((item_id, True))
+                continue
+            known_statuses[item_id] = cached_status
+
+        if known_statuses[item_id] != status:
+            changed_ids.append((item_id, True))
+        elif now - os.path.getmtime(detail_path) > max_age:
+            stale_ids.append((item_id, True))
+
+    logging.info(f"Новых: {len(new_ids)}, со сменой статуса: {len(changed_ids)}, устаревших: {len(stale_ids)}")
+    return new_ids + changed_ids + stale_ids
+
+
+def prefetch_details(
+    ids_to_fetch: list[tuple[str, bool]],
+    fetch_details: Callable,
+    current_statuses: dict,
+    known_statuses: dict,
+    budget: dict,
+) -> int:
+    fetched = 0
+    for item_id, refresh in ids_to_fetch:
+        if budget_exhausted(budget):
+            logging.info("Лимит запросов на цикл исчерпан, оставшиеся карточки будут загружены в следующем цикле")
+            break
+        try:
+            fetch_details(int(item_id), refresh=refresh)
+        except BearerTokenError:
+            raise
+        except Exception as e:
+            logging.error(f"Не удалось загрузить карточку {item_id}: {e}")
+        else:
+            known_statuses[item_id] = current_statuses[item_id]
+            fetched += 1
+        finally:
+            spend_request(budget)
+
+    return fetched
+
+
+def run_prefetch_cycle() -> None:
+    tech_reg_types = [id.strip() for id in IDS_TECH_REG.split(",")]
+    _, filtered_trts = get_trts_data(tech_reg_types)
+    budget = new_budget()
+    state = load_prefetch_state()
+
+    for registry, name, data_path, details_dir, fetch_all_pages, fetch_details in REGISTRIES:
+        if not os.path.exists(details_dir):
+            os.makedirs(details_dir)
+
+        known_statuses = state.setdefault(registry, {})
+        try:
+            logging.info(f"Обновление списка {name}")
+            current_statuses = refresh_listing(data_path, fetch_all_pages, filtered_trts, budget)
+            if not current_statuses:
+                logging.info(f"Список {name} пуст, предзагрузка не требуется")
+                continue
+
+            ids_to_fetch = select_ids_to_fetch(details_dir, known_statuses, current_statuses)
+            fetched = prefetch_details(ids_to_fetch, fetch_details, current_statuses, known_statuses, budget)
+            logging.info(f"Загружено карточек {name}: {fetched}")
+        except BearerTokenError:
+            raise
+        except Exception as e:
+            logging.exception(f"Ошибка предзагрузки {name}: {e}")
+        finally:
+            save_json_file(state, PREFETCH_STATE_PATH)
+
+
+def run_prefetch(once: bool = False) -> None:
+    while True:
+        try:
+            run_prefetch_cycle()
+        except BearerTokenError:
+            raise
+        except Exception as e:
+            logging.exception(f"Ошибка цикла предзагрузки: {e}")
+
+        if once:
+            break
+        logging.info(f"Следующий цикл предзагрузки через {PREFETCH_INTERVAL} сек.")
+        time.sleep(PREFETCH_INTERVAL)
+
+
+if __name__ == "__main__":
+    try:
+        run_prefetch(once="--once" in sys.argv[1:])
+    except KeyboardInterrupt:
+        exit("Предзагрузка остановлена вручную. Процесс завершен.")